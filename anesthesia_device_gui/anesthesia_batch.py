@@ -0,0 +1,154 @@
+"""
+Vectorized scenario sweeps over the anesthesia_eval checks (needs NumPy).
+
+This module stays interpreted: only the scalar evaluator is compiled with mypyc.
+"""
+from typing import Any, Dict
+
+import numpy as np
+
+from anesthesia_eval import (
+    AGENTS, BIT_AGENT_HI, BIT_AGENT_WARN, BIT_FGF_GT10, BIT_FGF_LT05, BIT_FGF_VERY_LOW_AGENT,
+    BIT_FGF_ZERO_AGENT, BIT_FIO2_LT21, BIT_FIO2_LT30, BIT_FIO2_LT40, BIT_HYPOXIC_GUARD,
+    BIT_LEAK, BIT_MV_BORDERLINE, BIT_MV_LOW, BIT_PAW_GT30, BIT_PAW_GT40, BIT_RR_GT35,
+    BIT_RR_LOW, BIT_RR_LT6, BIT_VT_GT10, BIT_VT_HIGH, BIT_VT_LOW, BIT_VT_LT4,
+    _AGENT_ALARM_MAX, _AGENT_WARN_HIGH, _ALARM_BITS, _VT_MV_TABLE, _WARN_BITS, Agent,
+)
+
+
+def _batch_core(
+    fio2: np.ndarray,
+    fgf: np.ndarray,
+    agent_percent: np.ndarray,
+    agent_max: np.ndarray,
+    agent_warn: np.ndarray,
+    paw: np.ndarray,
+    vtkg: np.ndarray,
+    rr: np.ndarray,
+    mv: np.ndarray,
+    vt_rec_low: np.ndarray,
+    vt_rec_high: np.ndarray,
+    mv_alarm_low: np.ndarray,
+    mv_warn_low: np.ndarray,
+    hypoxic_guard_enabled: np.ndarray
+) -> np.ndarray:
+    """
+    Element-wise _evaluate_core(): the same BIT_* conditions, broadcast over arrays.
+
+    Kept out of the mypyc-compiled module so the scalar core keeps its float
+    signature; test_batch_matches_scalar guards the two against drift.
+    """
+    agent_on = agent_percent > 0
+
+    mask = (
+        # ---- Oxygen safety
+        BIT_FIO2_LT21 * (fio2 < 21)
+        | BIT_FIO2_LT30 * ((fio2 >= 21) & (fio2 < 30))
+        | BIT_FIO2_LT40 * ((fio2 >= 30) & (fio2 < 40))
+        | BIT_HYPOXIC_GUARD * (hypoxic_guard_enabled & (fio2 < 25))
+        # ---- Fresh Gas Flow (FGF) reasonableness
+        | BIT_FGF_ZERO_AGENT * ((fgf == 0) & agent_on)
+        | BIT_FGF_VERY_LOW_AGENT * ((fgf != 0) & (fgf <= 0.3) & agent_on)
+        | BIT_FGF_LT05 * (fgf < 0.5)
+        | BIT_FGF_GT10 * (fgf > 10)
+        # ---- Agent limits
+        | BIT_AGENT_HI * (agent_percent > agent_max)
+        | BIT_AGENT_WARN * ((agent_percent <= agent_max) & (agent_percent > agent_warn))
+        # VT alarms/warnings (mL/kg)
+        | BIT_VT_LT4 * (vtkg < 4.0)
+        | BIT_VT_LOW * ((vtkg >= 4.0) & (vtkg < vt_rec_low))
+        | BIT_VT_GT10 * (vtkg > 10.0)
+        | BIT_VT_HIGH * ((vtkg <= 10.0) & (vtkg > vt_rec_high))
+        # RR safety
+        | BIT_RR_LT6 * (rr < 6)
+        | BIT_RR_LOW * ((rr >= 6) & (rr < 8))
+        | BIT_RR_GT35 * (rr > 35)
+        # Minute ventilation adequacy
+        | BIT_MV_LOW * (mv < mv_alarm_low)
+        | BIT_MV_BORDERLINE * ((mv >= mv_alarm_low) & (mv < mv_warn_low))
+        # Airway pressure
+        | BIT_PAW_GT40 * (paw > 40)
+        | BIT_PAW_GT30 * ((paw <= 40) & (paw > 30))
+        # Disconnection/leak suspicion: low pressure + low MV
+        | BIT_LEAK * ((paw < 5) & (mv < mv_warn_low))
+    )
+    return mask
+
+
+def evaluate_anesthesia_realistic_batch(params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Vectorized evaluate_anesthesia_realistic over many parameter sets at once.
+
+    params holds one 1-D array per keyword argument of the scalar function
+    (same names; agent as Agent values or names). The clinical checks are the
+    array form of anesthesia_eval._evaluate_core(). Returns per-row arrays:
+
+    status: "RUNNING" | "WARNING" | "ALARM".
+    invalid: inputs failed the validity checks (mask is 0 for these rows).
+    mask: BIT_* conditions fired; alarm_mask / warn_mask split it by severity.
+    MV_Lmin, VT_mLkg: computed ventilation values.
+    """
+    patient_type = np.asarray(params["patient_type"])
+    weight = np.asarray(params["weight_kg"], dtype=float)
+    fio2 = np.asarray(params["fio2"], dtype=float)
+    fgf = np.asarray(params["fresh_gas_flow_lpm"], dtype=float)
+    agent = np.asarray(params["agent"])
+    agent_pct = np.asarray(params["agent_percent"], dtype=float)
+    paw = np.asarray(params["airway_pressure_cmh2o"], dtype=float)
+    vt = np.asarray(params["tidal_volume_ml"], dtype=float)
+    rr = np.asarray(params["resp_rate_bpm"], dtype=float)
+    guard = np.asarray(params["hypoxic_guard_enabled"], dtype=bool)
+
+    # ---- Validity (invalid rows skip clinical reasoning, as in the scalar path)
+    invalid = (
+        (weight <= 0) | (fio2 < 0) | (fio2 > 100) | (fgf < 0)
+        | (agent_pct < 0) | (rr < 0) | (vt < 0)
+    )
+
+    # ---- Agent thresholds, gathered by Agent index
+    if agent.size == 0:
+        agent = agent.astype(int)  # np.array([]) is float64; an empty sweep has no bad agents
+    elif agent.dtype.kind in "US":
+        matches = agent[:, None] == np.array(AGENTS)
+        known = matches.any(axis=1)
+        if not known.all():
+            raise ValueError(f"Unknown agent(s): {sorted(set(agent[~known].tolist()))}")
+        agent = matches.argmax(axis=1)
+    elif agent.dtype.kind not in "iu":
+        raise ValueError(f"agent must hold Agent values or names, got dtype {agent.dtype}")
+    elif agent.min() < 0 or agent.max() >= len(Agent):
+        raise ValueError("agent values out of range for Agent")
+    agent_max = np.array(_AGENT_ALARM_MAX)[agent]
+    agent_warn = np.array(_AGENT_WARN_HIGH)[agent]
+
+    # ---- Ventilation computations
+    mv = vt * rr / 1000.0
+    vtkg = np.divide(vt, weight, out=np.zeros_like(vt), where=weight > 0)
+
+    # VT ranges based on patient type (anything but "adult" is pediatric, as in the scalar path)
+    table = np.array([_VT_MV_TABLE["adult"], _VT_MV_TABLE["pediatric"]])
+    vt_rec_low, vt_rec_high, mv_alarm_low, mv_warn_low = table[np.where(patient_type == "adult", 0, 1)].T
+
+    mask = _batch_core(
+        fio2, fgf, agent_pct, agent_max, agent_warn,
+        paw, vtkg, rr, mv,
+        vt_rec_low, vt_rec_high, mv_alarm_low, mv_warn_low,
+        guard
+    )
+    mask = np.where(invalid, 0, mask)
+    alarm_mask = mask & _ALARM_BITS
+    warn_mask = mask & _WARN_BITS
+
+    status = np.where(
+        invalid | (alarm_mask != 0), "ALARM", np.where(warn_mask != 0, "WARNING", "RUNNING")
+    )
+
+    return {
+        "status": status,
+        "invalid": invalid,
+        "mask": mask,
+        "alarm_mask": alarm_mask,
+        "warn_mask": warn_mask,
+        "MV_Lmin": mv,
+        "VT_mLkg": vtkg,
+    }
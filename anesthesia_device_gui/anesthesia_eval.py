@@ -0,0 +1,302 @@
+from dataclasses import dataclass
+from enum import IntEnum
+from functools import lru_cache
+from typing import Dict, List, Literal, Optional, Tuple, Union
+
+
+# =========================
+# REALISTIC EVALUATION LOGIC
+# =========================
+PatientType = Literal["adult", "pediatric"]
+
+
+class Agent(IntEnum):
+    SEVO = 0
+    ISO = 1
+    DES = 2
+
+
+# Selectable patient types and agents, in display order (AGENTS is indexed by Agent)
+PATIENT_TYPES: Tuple[PatientType, PatientType] = ("adult", "pediatric")
+AGENTS: Tuple[str, str, str] = ("Sevoflurane", "Isoflurane", "Desflurane")
+
+
+def _to_agent(agent: Union[Agent, int, str]) -> Agent:
+    """Accept an Agent, its int value or its display name; reject anything else."""
+    if isinstance(agent, str):
+        if agent not in AGENTS:
+            raise ValueError(f"Unknown agent: {agent!r}")
+        return Agent(AGENTS.index(agent))
+    # bool is an int subclass and Agent(1.0) resolves to ISO; neither is an agent
+    if isinstance(agent, bool) or not isinstance(agent, int):
+        raise ValueError(f"Unknown agent: {agent!r}")
+    return Agent(agent)  # ValueError for out-of-range values such as -1
+
+
+# Agent limits (simplified realistic), % concentration, indexed by Agent
+_AGENT_ALARM_MAX: Tuple[float, float, float] = (4.0, 3.0, 10.0)
+_AGENT_WARN_HIGH: Tuple[float, float, float] = (3.0, 2.5, 8.0)
+
+# Per patient type: (VT rec low, VT rec high) in mL/kg, (MV alarm low, MV warn low) in L/min
+_VT_MV_TABLE: Dict[str, Tuple[float, float, float, float]] = {
+    "adult": (6.0, 8.0, 3.0, 4.0),
+    "pediatric": (5.0, 8.0, 0.8, 1.2),
+}
+# Pre-rendered "low-high" VT target shown with the computed values
+_VT_TARGET: Dict[str, str] = {pt: f"{row[0]}-{row[1]}" for pt, row in _VT_MV_TABLE.items()}
+
+
+# Condition bits set by _evaluate_core(), in evaluation order
+BIT_FIO2_LT21 = 1 << 0
+BIT_FIO2_LT30 = 1 << 1
+BIT_FIO2_LT40 = 1 << 2
+BIT_HYPOXIC_GUARD = 1 << 3
+BIT_FGF_ZERO_AGENT = 1 << 4
+BIT_FGF_VERY_LOW_AGENT = 1 << 5
+BIT_FGF_LT05 = 1 << 6
+BIT_FGF_GT10 = 1 << 7
+BIT_AGENT_HI = 1 << 8
+BIT_AGENT_WARN = 1 << 9
+BIT_VT_LT4 = 1 << 10
+BIT_VT_LOW = 1 << 11
+BIT_VT_GT10 = 1 << 12
+BIT_VT_HIGH = 1 << 13
+BIT_RR_LT6 = 1 << 14
+BIT_RR_LOW = 1 << 15
+BIT_RR_GT35 = 1 << 16
+BIT_MV_LOW = 1 << 17
+BIT_MV_BORDERLINE = 1 << 18
+BIT_PAW_GT40 = 1 << 19
+BIT_PAW_GT30 = 1 << 20
+BIT_LEAK = 1 << 21
+
+# Message templates as (bit, template), in evaluation order. Placeholders are
+# filled from one context dict, and only for the bits _evaluate_core() set.
+_ALARM_TEMPLATES: Tuple[Tuple[int, str], ...] = (
+    (BIT_FIO2_LT21, "FiO₂ < 21% is not physiologically valid for delivered oxygen mixture."),
+    (BIT_FIO2_LT30, "HYPOXIC MIXTURE RISK: FiO₂ < 30% (high priority)."),
+    (BIT_HYPOXIC_GUARD, "Hypoxic Guard: FiO₂ below 25% → delivery should be inhibited."),
+    (BIT_FGF_ZERO_AGENT, "Agent set > 0% but FGF = 0 → inconsistent delivery (check settings)."),
+    (BIT_FGF_VERY_LOW_AGENT, "FGF very low with volatile agent → inadequate wash-in / unstable concentration."),
+    (BIT_AGENT_HI, "{agent} concentration too high (>{max_v}%)."),
+    (BIT_VT_LT4, "VT too low: {vtkg:.1f} mL/kg (<4)."),
+    (BIT_VT_GT10, "VT too high: {vtkg:.1f} mL/kg (>10)."),
+    (BIT_RR_LT6, "APNEA / severe bradypnea: RR < 6 bpm."),
+    (BIT_MV_LOW, "Low minute ventilation: MV {mv:.1f} L/min (too low)."),
+    (BIT_PAW_GT40, "HIGH AIRWAY PRESSURE > 40 cmH₂O (barotrauma risk)."),
+    (BIT_LEAK, "Possible DISCONNECTION/LEAK: low pressure AND low ventilation."),
+)
+_WARN_TEMPLATES: Tuple[Tuple[int, str], ...] = (
+    (BIT_FIO2_LT40, "Low FiO₂ (30–39%): monitor oxygenation & clinical context."),
+    (BIT_FGF_LT05, "Very low FGF (<0.5 L/min): risk of slow wash-in & CO₂ absorber dependence."),
+    (BIT_FGF_GT10, "High FGF (>10 L/min): wasteful, drying, heat loss risk."),
+    (BIT_AGENT_WARN, "{agent} concentration high (>{warn_v}%): consider reducing."),
+    (BIT_VT_LOW, "VT below recommended: {vtkg:.1f} mL/kg (target {vt_rec_low}-{vt_rec_high})."),
+    (BIT_VT_HIGH, "VT above recommended: {vtkg:.1f} mL/kg (target {vt_rec_low}-{vt_rec_high})."),
+    (BIT_RR_LOW, "Low RR (6–7 bpm): monitor ventilation adequacy."),
+    (BIT_RR_GT35, "High RR (>35 bpm): possible distress or overventilation."),
+    (BIT_MV_BORDERLINE, "Borderline MV: {mv:.1f} L/min (consider increasing VT/RR)."),
+    (BIT_PAW_GT30, "Elevated airway pressure (30–40 cmH₂O)."),
+)
+_ALARM_BITS = sum(bit for bit, _ in _ALARM_TEMPLATES)
+_WARN_BITS = sum(bit for bit, _ in _WARN_TEMPLATES)
+
+
+def _evaluate_core(
+    fio2: float,
+    fresh_gas_flow_lpm: float,
+    agent_percent: float,
+    agent_max: float,
+    agent_warn: float,
+    airway_pressure_cmh2o: float,
+    vt_ml_per_kg: float,
+    resp_rate_bpm: float,
+    mv_lpm: float,
+    vt_rec_low: float,
+    vt_rec_high: float,
+    mv_alarm_low: float,
+    mv_warn_low: float,
+    hypoxic_guard_enabled: bool
+) -> int:
+    """
+    Purely numeric clinical checks; returns a bitmask of fired BIT_* conditions.
+
+    Every elif-ladder is written as mutually exclusive range tests combined
+    with non-short-circuit `&`, so the mask is built without branching.
+    anesthesia_batch mirrors these expressions over NumPy arrays.
+    """
+    fgf = fresh_gas_flow_lpm
+    paw = airway_pressure_cmh2o
+    vtkg = vt_ml_per_kg
+    rr = resp_rate_bpm
+    mv = mv_lpm
+    agent_on = agent_percent > 0
+
+    mask = (
+        # ---- Oxygen safety
+        BIT_FIO2_LT21 * (fio2 < 21)
+        | BIT_FIO2_LT30 * ((fio2 >= 21) & (fio2 < 30))
+        | BIT_FIO2_LT40 * ((fio2 >= 30) & (fio2 < 40))
+        | BIT_HYPOXIC_GUARD * (hypoxic_guard_enabled & (fio2 < 25))
+        # ---- Fresh Gas Flow (FGF) reasonableness
+        | BIT_FGF_ZERO_AGENT * ((fgf == 0) & agent_on)
+        | BIT_FGF_VERY_LOW_AGENT * ((fgf != 0) & (fgf <= 0.3) & agent_on)
+        | BIT_FGF_LT05 * (fgf < 0.5)
+        | BIT_FGF_GT10 * (fgf > 10)
+        # ---- Agent limits
+        | BIT_AGENT_HI * (agent_percent > agent_max)
+        | BIT_AGENT_WARN * ((agent_percent <= agent_max) & (agent_percent > agent_warn))
+        # VT alarms/warnings (mL/kg)
+        | BIT_VT_LT4 * (vtkg < 4.0)
+        | BIT_VT_LOW * ((vtkg >= 4.0) & (vtkg < vt_rec_low))
+        | BIT_VT_GT10 * (vtkg > 10.0)
+        | BIT_VT_HIGH * ((vtkg <= 10.0) & (vtkg > vt_rec_high))
+        # RR safety
+        | BIT_RR_LT6 * (rr < 6)
+        | BIT_RR_LOW * ((rr >= 6) & (rr < 8))
+        | BIT_RR_GT35 * (rr > 35)
+        # Minute ventilation adequacy
+        | BIT_MV_LOW * (mv < mv_alarm_low)
+        | BIT_MV_BORDERLINE * ((mv >= mv_alarm_low) & (mv < mv_warn_low))
+        # Airway pressure
+        | BIT_PAW_GT40 * (paw > 40)
+        | BIT_PAW_GT30 * ((paw <= 40) & (paw > 30))
+        # Disconnection/leak suspicion: low pressure + low MV
+        | BIT_LEAK * ((paw < 5) & (mv < mv_warn_low))
+    )
+    return mask
+
+
+@dataclass(slots=True, frozen=True)
+class EvalInputs:
+    patient_type: PatientType
+    weight_kg: float
+    fio2: float
+    fresh_gas_flow_lpm: float
+    agent: int  # an Agent; validated by evaluate()
+    agent_percent: float
+    airway_pressure_cmh2o: float
+    tidal_volume_ml: float
+    resp_rate_bpm: float
+    hypoxic_guard_enabled: bool
+
+
+@dataclass(slots=True, frozen=True)
+class ComputedMetrics:
+    MV_Lmin: float
+    VT_mLkg: float
+    VT_target_mLkg: str
+
+
+@dataclass(slots=True, frozen=True)
+class EvalResult:
+    status: str  # "RUNNING" | "WARNING" | "ALARM"
+    alarms: Tuple[str, ...]
+    warnings: Tuple[str, ...]
+    computed: Optional[ComputedMetrics] = None  # None when the inputs are invalid
+
+
+# Pure function of a frozen input record with an immutable result, so repeated
+# inputs (GUI re-clicks, sweeps revisiting grid points) are served from cache.
+@lru_cache(maxsize=4096)
+def evaluate(inputs: EvalInputs) -> EvalResult:
+    patient_type = inputs.patient_type
+    weight_kg = inputs.weight_kg
+    fio2 = inputs.fio2
+    fresh_gas_flow_lpm = inputs.fresh_gas_flow_lpm
+    agent = Agent(inputs.agent)  # a stray -1 must not index the last agent's limits
+    agent_percent = inputs.agent_percent
+    airway_pressure_cmh2o = inputs.airway_pressure_cmh2o
+    tidal_volume_ml = inputs.tidal_volume_ml
+    resp_rate_bpm = inputs.resp_rate_bpm
+    hypoxic_guard_enabled = bool(inputs.hypoxic_guard_enabled)
+
+    alarms: List[str] = []
+    warnings: List[str] = []
+    add_alarm = alarms.append
+    add_warning = warnings.append
+
+    # ---- Validate basic numeric sanity (not "restrictions", but validity)
+    if weight_kg <= 0:
+        add_alarm("Invalid weight (must be > 0 kg).")
+    if fio2 < 0 or fio2 > 100:
+        add_alarm("Invalid FiO₂ (must be between 0 and 100%).")
+    if fresh_gas_flow_lpm < 0:
+        add_alarm("Invalid fresh gas flow (cannot be negative).")
+    if agent_percent < 0:
+        add_alarm("Invalid agent concentration (cannot be negative).")
+    if resp_rate_bpm < 0:
+        add_alarm("Invalid respiratory rate (cannot be negative).")
+    if tidal_volume_ml < 0:
+        add_alarm("Invalid tidal volume (cannot be negative).")
+
+    # If invalids exist, stop further clinical reasoning
+    if alarms:
+        return EvalResult("ALARM", tuple(alarms), ())
+
+    # ---- Agent limits (simplified realistic)
+    max_v = _AGENT_ALARM_MAX[agent]
+    warn_v = _AGENT_WARN_HIGH[agent]
+
+    # ---- Ventilation computations
+    mv_lpm = (tidal_volume_ml * resp_rate_bpm) / 1000.0  # L/min
+    vt_ml_per_kg = tidal_volume_ml / weight_kg if weight_kg > 0 else 0.0
+
+    # VT ranges based on patient type
+    vt_rec_low, vt_rec_high, mv_alarm_low, mv_warn_low = _VT_MV_TABLE.get(
+        patient_type, _VT_MV_TABLE["pediatric"]
+    )
+
+    mask: int = _evaluate_core(
+        fio2, fresh_gas_flow_lpm, agent_percent, max_v, warn_v,
+        airway_pressure_cmh2o, vt_ml_per_kg, resp_rate_bpm, mv_lpm,
+        vt_rec_low, vt_rec_high, mv_alarm_low, mv_warn_low,
+        hypoxic_guard_enabled
+    )
+
+    computed = ComputedMetrics(
+        MV_Lmin=mv_lpm,
+        VT_mLkg=vt_ml_per_kg,
+        VT_target_mLkg=_VT_TARGET.get(patient_type, _VT_TARGET["pediatric"])
+    )
+
+    # Common case: nothing fired, so there is no text to format
+    if not mask:
+        return EvalResult("RUNNING", (), (), computed)
+
+    # Text is only formatted for the conditions that fired
+    ctx: Dict[str, object] = {
+        "agent": AGENTS[agent], "max_v": max_v, "warn_v": warn_v, "vtkg": vt_ml_per_kg,
+        "vt_rec_low": vt_rec_low, "vt_rec_high": vt_rec_high, "mv": mv_lpm,
+    }
+    if mask & _ALARM_BITS:
+        for bit, tpl in _ALARM_TEMPLATES:
+            if mask & bit:
+                add_alarm(tpl.format_map(ctx))
+    if mask & _WARN_BITS:
+        for bit, tpl in _WARN_TEMPLATES:
+            if mask & bit:
+                add_warning(tpl.format_map(ctx))
+
+    status = "ALARM" if alarms else "WARNING"
+
+    return EvalResult(status, tuple(alarms), tuple(warnings), computed)
+
+
+def evaluate_anesthesia_realistic(
+    patient_type: PatientType,
+    weight_kg: float,
+    fio2: float,
+    fresh_gas_flow_lpm: float,
+    agent: Union[Agent, int, str],
+    agent_percent: float,
+    airway_pressure_cmh2o: float,
+    tidal_volume_ml: float,
+    resp_rate_bpm: float,
+    hypoxic_guard_enabled: bool
+) -> EvalResult:
+    return evaluate(EvalInputs(
+        patient_type, weight_kg, fio2, fresh_gas_flow_lpm, _to_agent(agent), agent_percent,
+        airway_pressure_cmh2o, tidal_volume_ml, resp_rate_bpm, hypoxic_guard_enabled
+    ))
+
@@ -0,0 +1,22 @@
+from setuptools import setup
+
+# The GUI stays interpreted; only the PyQt-free evaluator is compiled with mypyc.
+# Without mypy installed, anesthesia_eval is installed as a plain module instead.
+try:
+    from mypyc.build import mypycify
+except ImportError:
+    py_modules = ["anesthesia_machine_UI", "anesthesia_batch", "anesthesia_eval"]
+    ext_modules = []
+else:
+    py_modules = ["anesthesia_machine_UI", "anesthesia_batch"]
+    ext_modules = mypycify(["anesthesia_device_gui/anesthesia_eval.py"])
+
+setup(
+    name="anesthesia-machine-safety-simulation",
+    package_dir={"": "anesthesia_device_gui"},
+    py_modules=py_modules,
+    ext_modules=ext_modules,
+    python_requires=">=3.10",
+    install_requires=["pyqt5"],
+    extras_require={"batch": ["numpy"]},
+)
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The GUI and evaluator are top-level modules living in anesthesia_device_gui/
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "anesthesia_device_gui"))
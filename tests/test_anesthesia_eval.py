@@ -0,0 +1,224 @@
+import itertools
+import random
+
+import pytest
+
+from anesthesia_eval import (
+    _ALARM_TEMPLATES, _WARN_TEMPLATES, Agent, EvalInputs, evaluate,
+    evaluate_anesthesia_realistic,
+)
+
+
+# Nominal adult settings; every case below overrides only what it tests
+DEFAULTS = dict(
+    patient_type="adult",
+    weight_kg=70.0,
+    fio2=50.0,
+    fresh_gas_flow_lpm=4.0,
+    agent=Agent.SEVO,
+    agent_percent=2.0,
+    airway_pressure_cmh2o=18.0,
+    tidal_volume_ml=500.0,
+    resp_rate_bpm=12.0,
+    hypoxic_guard_enabled=True,
+)
+
+FIO2_INVALID = "FiO₂ < 21% is not physiologically valid for delivered oxygen mixture."
+FIO2_HYPOXIC = "HYPOXIC MIXTURE RISK: FiO₂ < 30% (high priority)."
+FIO2_LOW = "Low FiO₂ (30–39%): monitor oxygenation & clinical context."
+GUARD = "Hypoxic Guard: FiO₂ below 25% → delivery should be inhibited."
+FGF_ZERO = "Agent set > 0% but FGF = 0 → inconsistent delivery (check settings)."
+FGF_VERY_LOW_AGENT = "FGF very low with volatile agent → inadequate wash-in / unstable concentration."
+FGF_LOW = "Very low FGF (<0.5 L/min): risk of slow wash-in & CO₂ absorber dependence."
+FGF_HIGH = "High FGF (>10 L/min): wasteful, drying, heat loss risk."
+APNEA = "APNEA / severe bradypnea: RR < 6 bpm."
+RR_LOW = "Low RR (6–7 bpm): monitor ventilation adequacy."
+RR_HIGH = "High RR (>35 bpm): possible distress or overventilation."
+PAW_HIGH = "HIGH AIRWAY PRESSURE > 40 cmH₂O (barotrauma risk)."
+PAW_ELEVATED = "Elevated airway pressure (30–40 cmH₂O)."
+LEAK = "Possible DISCONNECTION/LEAK: low pressure AND low ventilation."
+
+
+def run(**overrides):
+    return evaluate(EvalInputs(**{**DEFAULTS, **overrides}))
+
+
+@pytest.mark.parametrize("overrides, status, alarms, warnings", [
+    ({}, "RUNNING", [], []),
+    # FiO₂ 21 / 25 / 30 / 40
+    ({"fio2": 20.9}, "ALARM", [FIO2_INVALID, GUARD], []),
+    ({"fio2": 21.0}, "ALARM", [FIO2_HYPOXIC, GUARD], []),
+    ({"fio2": 25.0}, "ALARM", [FIO2_HYPOXIC], []),
+    ({"fio2": 24.0, "hypoxic_guard_enabled": False}, "ALARM", [FIO2_HYPOXIC], []),
+    ({"fio2": 30.0}, "WARNING", [], [FIO2_LOW]),
+    ({"fio2": 40.0}, "RUNNING", [], []),
+    # FGF 0 / 0.3 / 0.5 / 10
+    ({"fresh_gas_flow_lpm": 0.0}, "ALARM", [FGF_ZERO], [FGF_LOW]),
+    ({"fresh_gas_flow_lpm": 0.0, "agent_percent": 0.0}, "WARNING", [], [FGF_LOW]),
+    ({"fresh_gas_flow_lpm": 0.3}, "ALARM", [FGF_VERY_LOW_AGENT], [FGF_LOW]),
+    ({"fresh_gas_flow_lpm": 0.5}, "RUNNING", [], []),
+    ({"fresh_gas_flow_lpm": 10.0}, "RUNNING", [], []),
+    ({"fresh_gas_flow_lpm": 10.5}, "WARNING", [], [FGF_HIGH]),
+    # RR 6 / 8 / 35
+    ({"resp_rate_bpm": 5.9}, "ALARM", [APNEA, "Low minute ventilation: MV 3.0 L/min (too low)."], []),
+    ({"resp_rate_bpm": 6.0}, "WARNING", [], [RR_LOW, "Borderline MV: 3.0 L/min (consider increasing VT/RR)."]),
+    ({"resp_rate_bpm": 8.0}, "RUNNING", [], []),
+    ({"resp_rate_bpm": 35.0}, "RUNNING", [], []),
+    ({"resp_rate_bpm": 36.0}, "WARNING", [], [RR_HIGH]),
+    # PAW 5 / 30 / 40
+    ({"airway_pressure_cmh2o": 5.0, "resp_rate_bpm": 6.0}, "WARNING", [],
+     [RR_LOW, "Borderline MV: 3.0 L/min (consider increasing VT/RR)."]),
+    ({"airway_pressure_cmh2o": 4.9, "resp_rate_bpm": 6.0}, "ALARM", [LEAK],
+     [RR_LOW, "Borderline MV: 3.0 L/min (consider increasing VT/RR)."]),
+    ({"airway_pressure_cmh2o": 30.0}, "RUNNING", [], []),
+    ({"airway_pressure_cmh2o": 30.5}, "WARNING", [], [PAW_ELEVATED]),
+    ({"airway_pressure_cmh2o": 40.0}, "WARNING", [], [PAW_ELEVATED]),
+    ({"airway_pressure_cmh2o": 40.5}, "ALARM", [PAW_HIGH], []),
+    # Agent warn / alarm limits are exclusive of each other
+    ({"agent_percent": 3.0}, "RUNNING", [], []),
+    ({"agent_percent": 4.0}, "WARNING", [], ["Sevoflurane concentration high (>3.0%): consider reducing."]),
+    ({"agent_percent": 4.5}, "ALARM", ["Sevoflurane concentration too high (>4.0%)."], []),
+    ({"agent": Agent.DES, "agent_percent": 9.0}, "WARNING", [],
+     ["Desflurane concentration high (>8.0%): consider reducing."]),
+    # VT per kg: pediatric 5–6 mL/kg is nominal, adult is below recommended
+    ({"patient_type": "pediatric", "weight_kg": 20.0, "tidal_volume_ml": 110.0, "resp_rate_bpm": 20.0},
+     "RUNNING", [], []),
+    ({"patient_type": "adult", "weight_kg": 20.0, "tidal_volume_ml": 110.0, "resp_rate_bpm": 20.0},
+     "ALARM", ["Low minute ventilation: MV 2.2 L/min (too low)."],
+     ["VT below recommended: 5.5 mL/kg (target 6.0-8.0)."]),
+    ({"patient_type": "pediatric", "weight_kg": 20.0, "tidal_volume_ml": 90.0, "resp_rate_bpm": 20.0},
+     "WARNING", [], ["VT below recommended: 4.5 mL/kg (target 5.0-8.0)."]),
+    ({"patient_type": "pediatric", "weight_kg": 20.0, "tidal_volume_ml": 170.0, "resp_rate_bpm": 20.0},
+     "WARNING", [], ["VT above recommended: 8.5 mL/kg (target 5.0-8.0)."]),
+    ({"tidal_volume_ml": 750.0}, "ALARM", ["VT too high: 10.7 mL/kg (>10)."], []),
+    # Several conditions at once keep evaluation order within each list
+    ({"fio2": 28.0, "fresh_gas_flow_lpm": 0.2, "agent_percent": 5.0, "tidal_volume_ml": 250.0,
+      "resp_rate_bpm": 36.0, "airway_pressure_cmh2o": 3.0},
+     "ALARM",
+     [FIO2_HYPOXIC, FGF_VERY_LOW_AGENT, "Sevoflurane concentration too high (>4.0%).", "VT too low: 3.6 mL/kg (<4)."],
+     [FGF_LOW, RR_HIGH]),
+])
+def test_boundaries(overrides, status, alarms, warnings):
+    result = run(**overrides)
+    assert result.status == status
+    assert list(result.alarms) == alarms
+    assert list(result.warnings) == warnings
+
+
+def test_computed_metrics():
+    comp = run(patient_type="pediatric", weight_kg=20.0, tidal_volume_ml=110.0, resp_rate_bpm=20.0).computed
+    assert comp.MV_Lmin == pytest.approx(2.2)
+    assert comp.VT_mLkg == pytest.approx(5.5)
+    assert comp.VT_target_mLkg == "5.0-8.0"
+
+
+def test_invalid_inputs_skip_clinical_checks():
+    result = run(weight_kg=0.0, tidal_volume_ml=-1.0)
+    assert result.status == "ALARM"
+    assert result.alarms == ("Invalid weight (must be > 0 kg).", "Invalid tidal volume (cannot be negative).")
+    assert result.warnings == ()
+    assert result.computed is None
+
+
+def _batch_rows():
+    # Every boundary combination of the thresholds, plus a random sweep
+    rows = [
+        {**DEFAULTS, "fio2": fio2, "fresh_gas_flow_lpm": fgf, "resp_rate_bpm": rr,
+         "airway_pressure_cmh2o": paw, "patient_type": patient_type}
+        for fio2, fgf, rr, paw, patient_type in itertools.product(
+            (-1.0, 20.9, 21.0, 24.9, 25.0, 30.0, 40.0),
+            (0.0, 0.3, 0.5, 10.0, 10.5),
+            (5.9, 6.0, 8.0, 35.0, 36.0),
+            (4.9, 5.0, 30.0, 40.0, 40.5),
+            ("adult", "pediatric"),
+        )
+    ]
+    rng = random.Random(0)
+    for _ in range(5000):
+        rows.append({
+            "patient_type": rng.choice(("adult", "pediatric")),
+            "weight_kg": rng.choice((0.0, 10.0, 20.0, 70.0, rng.uniform(-5, 120))),
+            "fio2": rng.uniform(-5, 105),
+            "fresh_gas_flow_lpm": rng.choice((0.0, 0.3, rng.uniform(-1, 12))),
+            "agent": rng.choice(list(Agent)),
+            "agent_percent": rng.choice((0.0, rng.uniform(-1, 12))),
+            "airway_pressure_cmh2o": rng.uniform(0, 50),
+            "tidal_volume_ml": rng.uniform(-10, 900),
+            "resp_rate_bpm": rng.uniform(-1, 50),
+            "hypoxic_guard_enabled": rng.random() < 0.5,
+        })
+    return rows
+
+
+def test_batch_matches_scalar():
+    np = pytest.importorskip("numpy")
+    from anesthesia_batch import evaluate_anesthesia_realistic_batch
+    rows = _batch_rows()
+    out = evaluate_anesthesia_realistic_batch(
+        {key: np.array([row[key] for row in rows]) for key in DEFAULTS}
+    )
+    for i, row in enumerate(rows):
+        expected = evaluate(EvalInputs(**row))
+        assert out["status"][i] == expected.status, row
+        assert out["invalid"][i] == (expected.computed is None), row
+        if expected.computed is None:
+            assert out["mask"][i] == 0, row
+            continue
+        assert out["MV_Lmin"][i] == pytest.approx(expected.computed.MV_Lmin)
+        assert out["VT_mLkg"][i] == pytest.approx(expected.computed.VT_mLkg)
+        for templates, mask, messages in (
+            (_ALARM_TEMPLATES, out["alarm_mask"][i], expected.alarms),
+            (_WARN_TEMPLATES, out["warn_mask"][i], expected.warnings),
+        ):
+            fired = [tpl for bit, tpl in templates if mask & bit]
+            assert len(fired) == len(messages), row
+            for tpl, msg in zip(fired, messages):
+                assert msg.startswith(tpl.split("{")[0]), row
+
+
+def test_wrapper_accepts_agent_names():
+    by_name = evaluate_anesthesia_realistic(**{**DEFAULTS, "agent": "Desflurane", "agent_percent": 9.0})
+    by_enum = evaluate_anesthesia_realistic(**{**DEFAULTS, "agent": Agent.DES, "agent_percent": 9.0})
+    assert by_name == by_enum
+    assert by_name.warnings == ("Desflurane concentration high (>8.0%): consider reducing.",)
+
+
+@pytest.mark.parametrize("agent", ["Xenon", -1, 3])
+def test_unknown_agent_is_rejected(agent):
+    with pytest.raises(ValueError):
+        evaluate_anesthesia_realistic(**{**DEFAULTS, "agent": agent})
+    if not isinstance(agent, str):
+        with pytest.raises(ValueError):
+            run(agent=agent)
+
+
+def test_bool_and_float_agents_are_rejected():
+    # Both would otherwise resolve to Agent.ISO
+    with pytest.raises(ValueError):
+        evaluate_anesthesia_realistic(**{**DEFAULTS, "agent": True})
+    # The mypyc build rejects the float at the call boundary with TypeError
+    with pytest.raises((TypeError, ValueError)):
+        evaluate_anesthesia_realistic(**{**DEFAULTS, "agent": 1.0})
+
+
+def test_batch_agent_names_and_rejects_unknown():
+    np = pytest.importorskip("numpy")
+    from anesthesia_batch import evaluate_anesthesia_realistic_batch
+    params = {key: np.array([value] * 3) for key, value in DEFAULTS.items()}
+    params["agent_percent"] = np.array([9.0, 9.0, 9.0])
+
+    params["agent"] = np.array(["Sevoflurane", "Isoflurane", "Desflurane"])
+    assert list(evaluate_anesthesia_realistic_batch(params)["status"]) == ["ALARM", "ALARM", "WARNING"]
+
+    for bad in (np.array(["Sevoflurane", "Xenon", "Desflurane"]), np.array([0, -1, 2])):
+        params["agent"] = bad
+        with pytest.raises(ValueError):
+            evaluate_anesthesia_realistic_batch(params)
+
+
+def test_batch_empty_sweep():
+    np = pytest.importorskip("numpy")
+    from anesthesia_batch import evaluate_anesthesia_realistic_batch
+    # np.array([]) is float64, which must not trip the agent dtype check
+    out = evaluate_anesthesia_realistic_batch({key: np.array([]) for key in DEFAULTS})
+    assert all(len(value) == 0 for value in out.values())
@@ -0,0 +1,73 @@
+import os
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+QtWidgets = pytest.importorskip("PyQt5.QtWidgets")
+from PyQt5.QtGui import QValidator  # noqa: E402
+
+from anesthesia_eval import Agent  # noqa: E402
+from anesthesia_machine_UI import AnesthesiaStartRealistic  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+@pytest.fixture
+def window(app):
+    w = AnesthesiaStartRealistic()
+    yield w
+    w.deleteLater()
+
+
+def press_start(window, app):
+    window.on_start()
+    app.processEvents()
+
+
+def test_defaults_are_running(window, app):
+    press_start(window, app)
+    assert window.banner.text() == "RUNNING – Parameters accepted"
+    assert window.banner.property("state") == "run"
+    assert "CALCULATED" in window.output.toPlainText()
+
+
+def test_reset_then_start_is_invalid_input_alarm(window, app):
+    window.reset_fields()
+    assert window.banner.property("state") == "idle"
+    press_start(window, app)
+    assert window.banner.text() == "ALARM – Invalid numeric input"
+    assert window.banner.property("state") == "alarm"
+
+
+def test_intermediate_text_is_rejected(window, app):
+    # The validator lets "-1e" through while typing; parsing must not
+    assert window.fio2.validator().validate("-1e", 0)[0] == QValidator.Intermediate
+    window.fio2.setText("-1e")
+    assert window._parsed["FiO₂ (%)"] is None
+    press_start(window, app)
+    assert window.banner.text() == "ALARM – Invalid numeric input"
+
+
+def test_combos_update_cached_selection(window):
+    window.agent.setCurrentIndex(2)
+    window.patient_type.setCurrentIndex(1)
+    assert window._agent is Agent.DES
+    assert window._patient_idx == 1
+    window.load_defaults()
+    assert window._agent is Agent.SEVO
+    assert window._patient_idx == 0
+
+
+def test_double_start_runs_one_evaluation(window, app, monkeypatch):
+    calls = []
+    monkeypatch.setattr(window, "_run_eval", lambda: calls.append(1))
+    window.on_start()
+    window.on_start()
+    assert not window.start_btn.isEnabled()
+    assert calls == []
+    app.processEvents()
+    assert calls == [1]
+    assert window.start_btn.isEnabled()